@@ -5,46 +5,104 @@ Watches a folder and automatically renames screenshots using OpenAI GPT-4 Vision
 """
 
 import argparse
+import asyncio
 import base64
+import ctypes
+import errno
+import hashlib
 import io
+import json
 import os
 import re
+import string
 import plistlib
-import subprocess
 import sys
+import tempfile
 import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from PIL import Image
-from watchdog.observers.polling import PollingObserver
-from watchdog.events import FileSystemEventHandler
+from watchfiles import Change, awatch
+
+# Optional: libvips resizes much faster than Pillow when it's installed
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+# Image budget for vision requests. With detail 'low' the API works from a
+# ~512px image, so a larger or higher-quality upload is wasted bandwidth.
+VISION_BUDGET = {'max_edge': 512, 'quality': 70, 'detail': 'low'}
 
 # Max image dimension for processing
-MAX_IMAGE_SIZE = 1024
+MAX_IMAGE_SIZE = VISION_BUDGET['max_edge']
 
-# Supported image extensions
-IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp'}
+# Supported image extensions (a tuple so it can be passed to str.endswith)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp')
 
 # Default OpenAI model
 DEFAULT_MODEL = 'gpt-4o-mini'
 
-# AI prompt for generating filenames
-FILENAME_PROMPT = """Look at this screenshot and generate a descriptive filename.
+# Max OpenAI requests in flight at once
+MAX_CONCURRENT_REQUESTS = 5
+
+# Max prepared or described images waiting between batch pipeline stages
+PIPELINE_QUEUE_SIZE = 4
+
+# watchfiles reports a change set once the folder has been quiet for
+# WATCH_STEP_MS, or after WATCH_DEBOUNCE_MS at most while changes keep coming
+WATCH_STEP_MS = 200
+WATCH_DEBOUNCE_MS = 1600
+
+# Interval between size/mtime checks while waiting for a file to finish
+# being written
+WATCH_SETTLE_SECONDS = 0.5
+
+# Seconds a path must go without new events before it's processed; every
+# added/modified event for the path restarts the wait
+WATCH_QUIET_SECONDS = 2.0
+
+# On-disk cache of AI descriptions and resized images, keyed by content hash
+# plus the settings that produced them
+CACHE_DIR = Path.home() / '.cache' / 'screenshout'
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Min seconds between cache size checks while watching
+CACHE_PRUNE_INTERVAL = 300
+
+# Patterns for cleaning AI output into filenames
+_RE_QUOTES = re.compile(r'^["\'`]|["\'`]$')
+_RE_PREFIX = re.compile(r'^(filename:|description:|here is|the filename is)\s*', re.IGNORECASE)
+_RE_SEP = re.compile(r'[\s_]+')
+_RE_KEEP = re.compile(r'[^a-z0-9-]')
+_RE_DASH = re.compile(r'-+')
+
+# Single-pass ASCII cleanup: whitespace and underscores become hyphens,
+# everything else outside [a-z0-9-] is dropped. Whitespace follows
+# str.isspace(), which matches what \s does in the regex fallback.
+_SEPARATORS = {chr(i) for i in range(128) if chr(i).isspace()} | {'_'}
+_FILENAME_TABLE = str.maketrans(
+    {c: '-' for c in _SEPARATORS}
+    | {chr(i): None for i in range(128)
+       if chr(i) not in _SEPARATORS
+       and chr(i) not in '-' + string.ascii_lowercase + string.digits}
+)
+
+# Date prefix marking files we've already renamed
+_RE_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}_')
 
-Be specific about what you see:
-- If it's an app, name the app and what's shown (e.g., "slack-dm-with-john-about-project")
-- If it's a webpage, include the site and content (e.g., "github-pull-request-review-comments")
-- If it's code, mention the language and what it does (e.g., "python-async-api-handler")
-- If it's a document, describe the content (e.g., "quarterly-sales-report-chart")
+# AI prompt for generating filenames
+FILENAME_PROMPT = """Generate a descriptive filename for this screenshot. Name the app, site, \
+code language or document and what it shows (e.g., "slack-dm-with-john-about-project", \
+"github-pull-request-review-comments", "python-async-api-handler").
 
-Rules:
-- Use lowercase letters and hyphens only
-- Be specific and descriptive (5-8 words is ideal)
-- No special characters or punctuation
+Rules: lowercase letters and hyphens only, 5-8 words, no punctuation.
 
-Respond with ONLY the filename, nothing else."""
+Respond with ONLY the filename."""
 
 
 def sanitize_filename(text: str, max_length: int = 60) -> str:
@@ -53,17 +111,17 @@ def sanitize_filename(text: str, max_length: int = 60) -> str:
     text = text.lower().strip()
 
     # Remove quotes and common prefixes AI might add
-    text = re.sub(r'^["\'`]|["\'`]$', '', text)
-    text = re.sub(r'^(filename:|description:|here is|the filename is)\s*', '', text, flags=re.IGNORECASE)
-
-    # Replace spaces and underscores with hyphens
-    text = re.sub(r'[\s_]+', '-', text)
+    text = _RE_QUOTES.sub('', text)
+    text = _RE_PREFIX.sub('', text)
 
-    # Keep only alphanumeric and hyphens
-    text = re.sub(r'[^a-z0-9-]', '', text)
+    # Replace spaces and underscores with hyphens, keep only alphanumeric
+    # and hyphens
+    text = text.translate(_FILENAME_TABLE)
+    if not text.isascii():
+        text = _RE_KEEP.sub('', _RE_SEP.sub('-', text))
 
     # Collapse multiple hyphens
-    text = re.sub(r'-+', '-', text)
+    text = _RE_DASH.sub('-', text)
 
     # Remove leading/trailing hyphens
     text = text.strip('-')
@@ -75,6 +133,36 @@ def sanitize_filename(text: str, max_length: int = 60) -> str:
     return text or 'screenshot'
 
 
+def _load_libc_setxattr():
+    """Bind libc's setxattr, which on macOS takes extra position and options arguments."""
+    try:
+        func = ctypes.CDLL(None, use_errno=True).setxattr
+    except (OSError, TypeError, AttributeError):
+        return None
+    func.argtypes = [
+        ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p,
+        ctypes.c_size_t, ctypes.c_uint32, ctypes.c_int,
+    ]
+    return func
+
+
+# os.setxattr is Linux-only; elsewhere (macOS) call libc directly
+_libc_setxattr = None if hasattr(os, 'setxattr') else _load_libc_setxattr()
+
+
+def setxattr(path: str, name: str, value: bytes) -> None:
+    """Write an extended attribute without spawning the xattr tool."""
+    if hasattr(os, 'setxattr'):
+        os.setxattr(path, name, value)
+        return
+
+    if _libc_setxattr is None:
+        raise OSError(errno.ENOTSUP, "Extended attributes are not supported", path)
+    if _libc_setxattr(os.fsencode(path), name.encode('utf-8'), value, len(value), 0, 0) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+
+
 def set_finder_comment(file_path: Path, comment: str) -> None:
     """Set the Finder comment for a file using xattr (requires binary plist)."""
     if not comment:
@@ -83,21 +171,8 @@ def set_finder_comment(file_path: Path, comment: str) -> None:
     try:
         # Create binary plist for the comment
         plist_data = plistlib.dumps(comment, fmt=plistlib.FMT_BINARY)
-        
-        # Convert to hex string for xattr -x
-        hex_data = plist_data.hex()
-        
-        # Use xattr with -x (hex input)
-        cmd = [
-            'xattr',
-            '-x',
-            '-w',
-            'com.apple.metadata:kMDItemFinderComment',
-            hex_data,
-            str(file_path.absolute())
-        ]
-        
-        subprocess.run(cmd, check=True, capture_output=True)
+
+        setxattr(str(file_path.absolute()), 'com.apple.metadata:kMDItemFinderComment', plist_data)
         print("  Added Finder comment")
     except Exception as e:
         print(f"  Warning: Error setting comment: {e}")
@@ -108,76 +183,262 @@ def get_unique_path(base_path: Path) -> Path:
     if not base_path.exists():
         return base_path
 
+    # On a collision, list the folder once rather than stat-ing each
+    # candidate. Compare casefolded names since the macOS filesystem is
+    # case-insensitive.
+    with os.scandir(base_path.parent) as entries:
+        names = {entry.name.casefold() for entry in entries}
+
     stem = base_path.stem
     suffix = base_path.suffix
-    parent = base_path.parent
 
     counter = 1
-    while True:
-        new_path = parent / f"{stem}-{counter}{suffix}"
-        if not new_path.exists():
-            return new_path
+    while f"{stem}-{counter}{suffix}".casefold() in names:
         counter += 1
+    return base_path.parent / f"{stem}-{counter}{suffix}"
 
 
-def resize_image_if_needed(image_path: str) -> bytes:
-    """Resize image if it's too large for efficient processing."""
+def resize_image_if_needed(image_path: str) -> tuple:
+    """Resize image if it's too large for efficient processing.
+
+    Returns (JPEG bytes, status note), with None for the bytes when the
+    original file can be sent unchanged. The note is returned rather than
+    printed since this usually runs in a worker process.
+    """
     with Image.open(image_path) as img:
+        # Opening only parses the header, so small RGB JPEGs can be sent
+        # as-is without a decode/encode round-trip
+        if max(img.size) <= MAX_IMAGE_SIZE and img.format == 'JPEG' and img.mode == 'RGB':
+            return None, ""
+
+        # libvips can't load every format Pillow can (e.g. BMP), so fall
+        # through to Pillow when it fails
+        if pyvips is not None:
+            try:
+                return resize_with_vips(image_path, img.size)
+            except pyvips.Error:
+                pass
+
+        # Let libjpeg decode at a reduced scale (no-op for non-JPEG)
+        img.draft('RGB', (MAX_IMAGE_SIZE, MAX_IMAGE_SIZE))
+
         # Convert to RGB if necessary (handles PNG with transparency)
         if img.mode in ('RGBA', 'P'):
             img = img.convert('RGB')
 
         # Resize if larger than max size
+        note = ""
         if max(img.size) > MAX_IMAGE_SIZE:
-            img.thumbnail((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE), Image.Resampling.LANCZOS)
-            print(f"  Resized to {img.size[0]}x{img.size[1]} for processing")
+            img.thumbnail((MAX_IMAGE_SIZE, MAX_IMAGE_SIZE), Image.Resampling.BILINEAR)
+            note = f"Resized to {img.size[0]}x{img.size[1]} for processing"
 
         # Save to bytes
         buffer = io.BytesIO()
-        img.save(buffer, format='JPEG', quality=85)
-        return buffer.getvalue()
+        img.save(
+            buffer,
+            format='JPEG',
+            quality=VISION_BUDGET['quality'],
+            optimize=False,
+            progressive=False,
+            subsampling=2,
+        )
+        return buffer.getvalue(), note
+
+
+def resize_with_vips(image_path: str, original_size: tuple) -> tuple:
+    """Resize and re-encode an image in one streaming libvips pass."""
+    img = pyvips.Image.thumbnail(image_path, MAX_IMAGE_SIZE, size='down')
+    note = ""
+    if max(original_size) > MAX_IMAGE_SIZE:
+        note = f"Resized to {img.width}x{img.height} for processing"
+    # Same encoder settings as the Pillow path; libvips already uses 4:2:0
+    # chroma subsampling below Q90
+    data = img.jpegsave_buffer(
+        Q=VISION_BUDGET['quality'],
+        strip=True,
+        optimize_coding=False,
+        interlace=False,
+    )
+    return data, note
+
 
+def file_digest(image_path: str) -> str:
+    """Hash a file's contents for use as a cache key."""
+    # Hash in chunks so huge images are never fully buffered just for this
+    with open(image_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
 
-def analyze_image(client: OpenAI, image_path: str, model: str = DEFAULT_MODEL) -> str:
-    """Send image to OpenAI for analysis."""
+        # hashlib.file_digest is Python 3.11+
+        h = hashlib.blake2b(digest_size=16)
+        while chunk := f.read(65536):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def read_cache(key: str, suffix: str) -> Optional[bytes]:
+    """Return a cache entry's contents and mark it as recently used."""
+    path = CACHE_DIR / f"{key}{suffix}"
     try:
-        # Resize large images before sending
-        image_bytes = resize_image_if_needed(image_path)
-        image_b64 = base64.b64encode(image_bytes).decode('utf-8')
-
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{
-                'role': 'user',
-                'content': [
-                    {'type': 'text', 'text': FILENAME_PROMPT},
-                    {
-                        'type': 'image_url',
-                        'image_url': {
-                            'url': f'data:image/jpeg;base64,{image_b64}',
-                            'detail': 'low'
-                        }
-                    }
-                ]
-            }],
-            max_tokens=100
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"Error analyzing image: {e}")
+        data = path.read_bytes()
+        os.utime(path)
+    except OSError:
+        return None
+    return data
+
+
+def write_cache(key: str, suffix: str, data: bytes, log: Callable[[str], None] = print) -> None:
+    """Store a cache entry, reporting but otherwise ignoring failures."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and move it into place, so an interrupted
+        # write never leaves a truncated entry behind
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, CACHE_DIR / f"{key}{suffix}")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        log(f"Warning: Could not write cache: {e}")
+
+
+def prune_cache() -> None:
+    """Evict least recently used entries once the cache exceeds its size limit."""
+    try:
+        entries = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def cache_key(digest: str, *settings: str) -> str:
+    """Combine a content digest with the settings a cache entry depends on."""
+    h = hashlib.blake2b(digest.encode('ascii'), digest_size=16)
+    for setting in settings:
+        h.update(b'\0')
+        h.update(setting.encode('utf-8'))
+    return h.hexdigest()
+
+
+def read_cached_description(key: str) -> str:
+    """Return a previously generated description, or an empty string."""
+    data = read_cache(key, '.json')
+    if data is None:
+        return ""
+    try:
+        return json.loads(data)['description']
+    except (ValueError, KeyError):
         return ""
 
 
-def rename_screenshot(client: OpenAI, file_path: Path, model: str = DEFAULT_MODEL, dry_run: bool = False) -> bool:
-    """Analyze and rename a single screenshot."""
-    print(f"Processing: {file_path.name}")
+async def prepare_image(image_path: str, model: str = DEFAULT_MODEL,
+                        executor: Optional[Executor] = None,
+                        log: Callable[[str], None] = print) -> tuple:
+    """Load an image, returning (cache key, cached description, resized JPEG).
+
+    Exactly one of the description or the JPEG is set: the description when
+    the image was analyzed before, otherwise the bytes to upload. Status
+    notes go to log, so callers can print them alongside the file's name.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Skip the API entirely for images we've already described. Cached
+    # entries are only valid for the settings that produced them.
+    digest = await loop.run_in_executor(None, file_digest, image_path)
+    budget = json.dumps(VISION_BUDGET, sort_keys=True)
+    image_key = cache_key(digest, budget)
+    description_key = cache_key(digest, budget, model, FILENAME_PROMPT)
+
+    description = await loop.run_in_executor(None, read_cached_description, description_key)
+    if description:
+        log("Using cached description")
+        return description_key, description, None
+
+    # Resize large images before sending, off the event loop so other
+    # requests keep making progress. Only now is the whole file loaded, by
+    # the worker rather than this process.
+    image_bytes = await loop.run_in_executor(None, read_cache, image_key, '.jpg')
+    if image_bytes is None:
+        image_bytes, note = await loop.run_in_executor(executor, resize_image_if_needed, image_path)
+        if note:
+            log(note)
+
+        # Only cache actual resizes; a copy of an unchanged file saves nothing
+        if image_bytes is None:
+            image_bytes = await loop.run_in_executor(None, Path(image_path).read_bytes)
+        else:
+            await loop.run_in_executor(None, write_cache, image_key, '.jpg', image_bytes, log)
+
+    return description_key, "", image_bytes
+
+
+async def request_description(client: AsyncOpenAI, key: str, image_bytes: bytes,
+                              model: str = DEFAULT_MODEL,
+                              log: Callable[[str], None] = print) -> str:
+    """Ask OpenAI to describe a prepared image and cache the answer."""
+    # The API only accepts images inline as a data URL string; base64
+    # output is pure ASCII, so decode it as such
+    image_b64 = base64.b64encode(image_bytes).decode('ascii')
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[{
+            'role': 'user',
+            'content': [
+                {'type': 'text', 'text': FILENAME_PROMPT},
+                {
+                    'type': 'image_url',
+                    'image_url': {
+                        'url': f'data:image/jpeg;base64,{image_b64}',
+                        'detail': VISION_BUDGET['detail']
+                    }
+                }
+            ]
+        }],
+        # Filenames are ~15 tokens; a low ceiling bounds worst-case latency
+        max_tokens=24,
+        temperature=0.2
+    )
+    description = response.choices[0].message.content
+    if description:
+        data = json.dumps({'description': description}).encode('utf-8')
+        await asyncio.get_running_loop().run_in_executor(None, write_cache, key, '.json', data, log)
+    return description
+
+
+async def analyze_image(client: AsyncOpenAI, image_path: str, model: str = DEFAULT_MODEL,
+                        executor: Optional[Executor] = None,
+                        log: Callable[[str], None] = print) -> str:
+    """Send image to OpenAI for analysis, resizing on the given executor."""
+    try:
+        key, description, image_bytes = await prepare_image(image_path, model, executor, log)
+        if description:
+            return description
+        return await request_description(client, key, image_bytes, model, log)
+    except Exception as e:
+        log(f"Error analyzing image: {e}")
+        return ""
 
-    # Get AI description
-    description = analyze_image(client, str(file_path), model)
-    if not description:
-        print(f"  Skipping: Could not analyze image")
-        return False
 
+def apply_description(file_path: Path, description: str, dry_run: bool = False) -> bool:
+    """Rename a screenshot after its AI description and tag it."""
     # Sanitize the description
     clean_name = sanitize_filename(description)
     print(f"  AI description: {description.strip()[:60]}...")
@@ -206,81 +467,134 @@ def rename_screenshot(client: OpenAI, file_path: Path, model: str = DEFAULT_MODE
         return False
 
 
-class ScreenshotHandler(FileSystemEventHandler):
-    """Handle new files in the watched folder."""
-
-    def __init__(self, client: OpenAI, model: str = DEFAULT_MODEL, delay: float = 2.0):
-        self.client = client
-        self.model = model
-        self.delay = delay
-        self.processed = set()
+def finish_screenshot(file_path: Path, description: str, notes: list, dry_run: bool = False) -> bool:
+    """Print a screenshot's header and notes, then rename it if it was described."""
+    print(f"Processing: {file_path.name}")
+    for note in notes:
+        print(f"  {note}")
+    if not description:
+        print(f"  Skipping: Could not analyze image")
+        return False
 
-    def handle_file(self, file_path: Path):
-        """Process a new or modified file."""
-        # Check if it's an image
-        if file_path.suffix.lower() not in IMAGE_EXTENSIONS:
-            return
+    try:
+        return apply_description(file_path, description, dry_run)
+    except Exception as e:
+        print(f"  Error renaming: {e}")
+        return False
 
-        # Avoid processing the same file twice
-        if str(file_path) in self.processed:
-            return
 
-        # Skip files that look already processed (date prefix)
-        if re.match(r'^\d{4}-\d{2}-\d{2}_', file_path.name):
-            return
+async def rename_screenshot(client: AsyncOpenAI, file_path: Path, model: str = DEFAULT_MODEL, dry_run: bool = False,
+                            executor: Optional[Executor] = None) -> bool:
+    """Analyze and rename a single screenshot."""
+    # Get AI description, holding its notes so concurrent files don't
+    # interleave their output
+    notes = []
+    description = await analyze_image(client, str(file_path), model, executor, notes.append)
+    return finish_screenshot(file_path, description, notes, dry_run)
 
-        print(f"Detected: {file_path.name}")
-        self.processed.add(str(file_path))
 
-        # Wait for file to be fully written
-        time.sleep(self.delay)
+async def wait_until_settled(file_path: Path) -> bool:
+    """Wait until a file stops changing. Returns False if it disappears."""
+    last = None
+    while True:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return False
+        current = (stat.st_size, stat.st_mtime_ns)
+        if current == last:
+            return True
+        last = current
+        await asyncio.sleep(WATCH_SETTLE_SECONDS)
+
+
+async def watch_folder(client: AsyncOpenAI, folder: Path, model: str = DEFAULT_MODEL):
+    """Watch a folder for new screenshots."""
+    print(f"Watching: {folder}")
+    print(f"Model: {model}")
+    print("Press Ctrl+C to stop\n")
 
-        # Verify file still exists (might have been moved/deleted)
-        if not file_path.exists():
-            print(f"  File no longer exists, skipping")
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    tasks = set()
+
+    # Per-path quiet-period timers. Each event restarts its path's timer, so
+    # a save reported as several added/modified events, possibly across
+    # change sets, is processed once after the last of them.
+    pending: dict[str, asyncio.TimerHandle] = {}
+
+    # Paths currently being processed
+    active = set()
+
+    async def handle(file_path: Path):
+        try:
+            # Wait for file to be fully written, and verify it still exists
+            # (might have been moved/deleted)
+            if not await wait_until_settled(file_path):
+                print(f"Skipping {file_path.name}: File no longer exists")
+                return
+            async with sem:
+                await rename_screenshot(client, file_path, model)
+        finally:
+            active.discard(str(file_path))
+
+    def start(path: str):
+        del pending[path]
+
+        # Still working on an earlier version; look again once it's done
+        if path in active:
+            pending[path] = loop.call_later(WATCH_QUIET_SECONDS, start, path)
             return
 
-        rename_screenshot(self.client, file_path, self.model)
+        active.add(path)
 
-    def on_created(self, event):
-        if event.is_directory:
-            return
-        self.handle_file(Path(event.src_path))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        task = asyncio.create_task(handle(Path(path)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
 
-    def on_modified(self, event):
-        if event.is_directory:
-            return
-        self.handle_file(Path(event.src_path))
+    # Trim the cache now and then, rather than after every image
+    await loop.run_in_executor(None, prune_cache)
+    last_prune = time.monotonic()
 
+    # awatch groups bursts of writes into a single change set
+    async for changes in awatch(folder, step=WATCH_STEP_MS, debounce=WATCH_DEBOUNCE_MS, recursive=False):
+        now = time.monotonic()
 
-def watch_folder(client: OpenAI, folder: Path, model: str = DEFAULT_MODEL):
-    """Watch a folder for new screenshots."""
-    print(f"Watching: {folder}")
-    print(f"Model: {model}")
-    print("Press Ctrl+C to stop\n")
+        if now - last_prune > CACHE_PRUNE_INTERVAL:
+            last_prune = now
+            await loop.run_in_executor(None, prune_cache)
 
-    handler = ScreenshotHandler(client, model=model)
-    observer = PollingObserver(timeout=1)
-    observer.schedule(handler, str(folder), recursive=False)
-    observer.start()
+        for change, path in changes:
+            if change == Change.deleted:
+                continue
 
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nStopping...")
-        observer.stop()
+            # Check if it's an image before building a Path
+            if not path.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+
+            file_path = Path(path)
+
+            # Skip files that look already processed (date prefix)
+            if _RE_DATE.match(file_path.name):
+                continue
 
-    observer.join()
+            # Restart the quiet period on every event
+            timer = pending.get(path)
+            if timer is not None:
+                timer.cancel()
+            elif path not in active:
+                print(f"Detected: {file_path.name}")
+            pending[path] = loop.call_later(WATCH_QUIET_SECONDS, start, path)
 
 
-def process_existing(client: OpenAI, folder: Path, model: str = DEFAULT_MODEL, dry_run: bool = False):
+def process_existing(client: AsyncOpenAI, folder: Path, model: str = DEFAULT_MODEL, dry_run: bool = False):
     """Process all existing screenshots in a folder."""
     images = [
         f for f in folder.iterdir()
         if f.is_file()
-        and f.suffix.lower() in IMAGE_EXTENSIONS
-        and not re.match(r'^\d{4}-\d{2}-\d{2}_', f.name)
+        and f.name.lower().endswith(IMAGE_EXTENSIONS)
+        and not _RE_DATE.match(f.name)
     ]
 
     if not images:
@@ -289,9 +603,70 @@ def process_existing(client: OpenAI, folder: Path, model: str = DEFAULT_MODEL, d
 
     print(f"Found {len(images)} screenshot(s) to process\n")
 
-    for img in images:
-        rename_screenshot(client, img, model, dry_run)
-        print()
+    async def run_pipeline(executor: Executor):
+        # Three stages joined by bounded queues, so reading/resizing, API
+        # calls and renames for different images all overlap
+        paths = asyncio.Queue()
+        for img in images:
+            paths.put_nowait(img)
+        prepared = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        described = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+        # Each image carries its own list of status notes through the stages,
+        # so the rename stage can print them as one block under its name
+        async def prepare_stage():
+            while not paths.empty():
+                img = paths.get_nowait()
+                notes = []
+                try:
+                    item = await prepare_image(str(img), model, executor, notes.append)
+                except Exception as e:
+                    notes.append(f"Error analyzing image: {e}")
+                    item = None
+                await prepared.put((img, item, notes))
+
+        async def request_stage():
+            while (entry := await prepared.get()) is not None:
+                img, item, notes = entry
+                description = ""
+                if item is not None:
+                    key, description, image_bytes = item
+                    if not description:
+                        try:
+                            description = await request_description(
+                                client, key, image_bytes, model, notes.append
+                            )
+                        except Exception as e:
+                            notes.append(f"Error analyzing image: {e}")
+                await described.put((img, description, notes))
+
+        async def rename_stage():
+            while (entry := await described.get()) is not None:
+                img, description, notes = entry
+                finish_screenshot(img, description, notes, dry_run)
+                print()
+
+        async def prepare_all():
+            # One preparer per core keeps the process pool busy
+            await asyncio.gather(*(prepare_stage() for _ in range(os.cpu_count() or 1)))
+            for _ in range(MAX_CONCURRENT_REQUESTS):
+                await prepared.put(None)
+
+        async def request_all():
+            # The request workers cap how many API calls are in flight
+            await asyncio.gather(*(request_stage() for _ in range(MAX_CONCURRENT_REQUESTS)))
+            await described.put(None)
+
+        # Run every stage under one gather so a failure anywhere surfaces
+        # immediately instead of leaving the other stages blocked on a queue
+        await asyncio.gather(prepare_all(), request_all(), rename_stage())
+
+    # Resizing is CPU-bound, so spread it across cores for large batches
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        asyncio.run(run_pipeline(executor))
+
+    # Trim the cache once per run rather than after every image
+    prune_cache()
 
 
 def main():
@@ -338,10 +713,13 @@ def main():
         sys.exit(1)
 
     # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    client = AsyncOpenAI(api_key=api_key)
 
     if args.watch:
-        watch_folder(client, folder, args.model)
+        try:
+            asyncio.run(watch_folder(client, folder, args.model))
+        except KeyboardInterrupt:
+            print("\nStopping...")
     else:
         process_existing(client, folder, args.model, args.dry_run)
 